@@ -1,13 +1,29 @@
 import jwt from 'jsonwebtoken';
 import User from '../models/User.js';
+import { createCache } from '../utils/cache.js';
+
+// Resolved on first use rather than at import: server.js calls dotenv.config() after its imports
+let jwtSecret;
+export const getJwtSecret = () => jwtSecret ??= (process.env.JWT_SECRET || 'shop_secret_fallback');
+
+// LRU of userId -> user (password excluded). PUT /users/:id invalidates in this process;
+// the TTL bounds staleness for changes made anywhere else (mongo shell, scripts, other processes)
+const userCache = createCache({ maxSize: 256, ttlMs: 60 * 1000 });
+
+const loadUser = (userId) => userCache.get(String(userId), async () => {
+  const user = await User.findById(userId).select('-password').lean();
+  return user && Object.freeze(user);
+});
+
+export const invalidateUserCache = (userId) => userCache.invalidate(String(userId));
 
 export const authenticate = async (req, res, next) => {
   try {
     const token = req.headers.authorization?.split(' ')[1];
     if (!token) return res.status(401).json({ error: 'Authentication required' });
 
-    const decoded = jwt.verify(token, process.env.JWT_SECRET || 'shop_secret_fallback');
-    const user = await User.findById(decoded.userId).select('-password');
+    const decoded = jwt.verify(token, getJwtSecret());
+    const user = await loadUser(decoded.userId);
     if (!user || !user.isActive) return res.status(401).json({ error: 'User inactive or not found' });
 
     req.user = user;
@@ -9,4 +9,6 @@ const customerSchema = new mongoose.Schema({
   totalSpent: { type: Number, default: 0 }
 }, { timestamps: true });
 
+customerSchema.index({ name: 1 });
+
 export default mongoose.model('Customer', customerSchema);
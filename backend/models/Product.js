@@ -11,4 +11,6 @@ const productSchema = new mongoose.Schema({
   supplier: { type: String, default: 'Direct Purchase' }
 }, { timestamps: true });
 
+productSchema.index({ name: 1 });
+
 export default mongoose.model('Product', productSchema);
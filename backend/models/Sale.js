@@ -21,4 +21,7 @@ const saleSchema = new mongoose.Schema({
   customer: { type: mongoose.Schema.Types.ObjectId, ref: 'Customer', default: null }
 }, { timestamps: true });
 
+// Listing sorts and "today" filters on createdAt
+saleSchema.index({ createdAt: -1 });
+
 export default mongoose.model('Sale', saleSchema);
@@ -5,7 +5,8 @@ const settingsSchema = new mongoose.Schema({
   taxRate: { type: Number, default: 0 }, // percentage
   currency: { type: String, default: 'USD' },
   address: { type: String, default: 'Shop Address, Kampala' },
-  phone: { type: String, default: '+256752972945' }
+  phone: { type: String, default: '+256752972945' },
+  seedVersion: { type: Number, default: 0 }
 }, { timestamps: true });
 
 export default mongoose.model('Settings', settingsSchema);
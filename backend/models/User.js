@@ -19,4 +19,6 @@ userSchema.methods.comparePassword = async function(candidatePassword) {
   return bcrypt.compare(candidatePassword, this.password);
 };
 
+userSchema.index({ createdAt: -1 });
+
 export default mongoose.model('User', userSchema);
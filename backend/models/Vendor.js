@@ -8,4 +8,6 @@ const vendorSchema = new mongoose.Schema({
   address: { type: String, trim: true, default: '' }
 }, { timestamps: true });
 
+vendorSchema.index({ name: 1 });
+
 export default mongoose.model('Vendor', vendorSchema);
@@ -1,41 +1,65 @@
 import express from 'express';
+import bcrypt from 'bcryptjs';
 import Sale from '../models/Sale.js';
 import Product from '../models/Product.js';
 import User from '../models/User.js';
-import { authenticate, requireRole } from '../middleware/auth.js';
+import { authenticate, requireRole, invalidateUserCache } from '../middleware/auth.js';
 
 const router = express.Router();
 
+const LOW_STOCK_FILTER = {
+  $expr: { $lte: ['$stockQuantity', '$lowStockThreshold'] }
+};
+
 // Get dashboard stats (Admin & Manager)
 router.get('/stats', authenticate, requireRole(['admin', 'manager']), async (req, res) => {
   try {
     const today = new Date();
     today.setHours(0,0,0,0);
 
-    // Today's sales
-    const todaySales = await Sale.find({ createdAt: { $gte: today } });
-    const todayRevenue = todaySales.reduce((sum, s) => sum + s.totalPrice, 0);
+    // The four figures are independent, so run their queries concurrently
+    const [todaySales, totalOrders, lowStockCount, [profit]] = await Promise.all([
+      // Today's sales
+      Sale.find({ createdAt: { $gte: today } }).select('totalPrice').lean(),
 
-    // Total sales orders
-    const totalOrders = await Sale.countDocuments();
+      // Total sales orders
+      Sale.estimatedDocumentCount(),
 
-    // Low stock count
-    const lowStockCount = await Product.countDocuments({
-      $expr: { $lte: ['$stockQuantity', '$lowStockThreshold'] }
-    });
+      // Low stock count
+      Product.countDocuments(LOW_STOCK_FILTER),
 
-    // Monthly Profit (Selling Price - Cost Price) * Quantity
-    const allSales = await Sale.find().populate('items.product');
-    let totalProfit = 0;
-    
-    allSales.forEach(sale => {
-      sale.items.forEach(item => {
-        if (item.product) {
-          const profitPerUnit = item.sellingPrice - (item.product.costPrice || 0);
-          totalProfit += profitPerUnit * item.quantity;
+      // Monthly Profit (Selling Price - Cost Price) * Quantity
+      // Join and sum inside MongoDB instead of loading every sale into memory
+      Sale.aggregate([
+        { $unwind: '$items' },
+        {
+          $lookup: {
+            from: Product.collection.name,
+            localField: 'items.product',
+            foreignField: '_id',
+            pipeline: [{ $project: { costPrice: 1 } }],
+            as: 'product'
+          }
+        },
+        { $unwind: '$product' },
+        {
+          $group: {
+            _id: null,
+            totalProfit: {
+              $sum: {
+                $multiply: [
+                  { $subtract: ['$items.sellingPrice', { $ifNull: ['$product.costPrice', 0] }] },
+                  '$items.quantity'
+                ]
+              }
+            }
+          }
         }
-      });
-    });
+      ])
+    ]);
+
+    const todayRevenue = todaySales.reduce((sum, s) => sum + s.totalPrice, 0);
+    const totalProfit = profit ? profit.totalProfit : 0;
 
     res.json({
       stats: {
@@ -55,7 +79,7 @@ router.get('/stats', authenticate, requireRole(['admin', 'manager']), async (req
 // User Accounts CRUD (Admin only)
 router.get('/users', authenticate, requireRole(['admin']), async (req, res) => {
   try {
-    const users = await User.find().select('-password').sort({ createdAt: -1 });
+    const users = await User.find().select('-password').sort({ createdAt: -1 }).lean();
     res.json({ users });
   } catch (err) {
     res.status(500).json({ error: 'Failed to retrieve users' });
@@ -76,6 +100,74 @@ router.post('/users', authenticate, requireRole(['admin']), async (req, res) =>
   }
 });
 
+// Each row costs a bcrypt-12 hash, so keep one request's work bounded
+const MAX_BULK_USERS = 50;
+const USER_ROLES = User.schema.path('role').enumValues;
+
+const isFilled = (value) => typeof value === 'string' && value.trim() !== '';
+
+// Bulk-create user accounts in one insert; existing usernames/emails are skipped
+router.post('/users/bulk', authenticate, requireRole(['admin']), async (req, res) => {
+  try {
+    const { users } = req.body;
+    if (!Array.isArray(users) || users.length === 0) return res.status(400).json({ error: 'Users list is required' });
+    if (users.length > MAX_BULK_USERS) return res.status(400).json({ error: `At most ${MAX_BULK_USERS} users per request` });
+
+    const invalid = users.findIndex(u => (
+      !u || !isFilled(u.username) || !isFilled(u.email) || !isFilled(u.password) ||
+      (u.role !== undefined && !USER_ROLES.includes(u.role))
+    ));
+    if (invalid !== -1) {
+      return res.status(400).json({ error: `User ${invalid + 1} needs a username, email, password and a valid role` });
+    }
+
+    const rows = users.map(u => ({
+      username: u.username.trim(),
+      email: u.email.trim().toLowerCase(),
+      password: u.password,
+      role: u.role || 'cashier'
+    }));
+
+    const existing = await User.find({
+      $or: [
+        { username: { $in: rows.map(r => r.username) } },
+        { email: { $in: rows.map(r => r.email) } }
+      ]
+    }).select('username email').lean();
+
+    const taken = new Set(existing.flatMap(u => [u.username, u.email]));
+    const fresh = rows.filter(r => {
+      if (taken.has(r.username) || taken.has(r.email)) return false;
+      taken.add(r.username);
+      taken.add(r.email);
+      return true;
+    });
+
+    // insertMany bypasses the pre('save') hook, so hash here
+    await Promise.all(fresh.map(async r => { r.password = await bcrypt.hash(r.password, 12); }));
+
+    // Unordered so a row taken by a concurrent insert is skipped instead of failing the batch
+    let created = [];
+    if (fresh.length) {
+      try {
+        created = await User.insertMany(fresh, { ordered: false });
+      } catch (err) {
+        const duplicatesOnly = err.writeErrors && err.writeErrors.every(e => e.code === 11000);
+        if (!duplicatesOnly) throw err;
+        created = err.insertedDocs || [];
+      }
+    }
+
+    res.status(201).json({
+      message: `${created.length} users created successfully`,
+      users: created.map(u => ({ id: u._id, username: u.username, email: u.email, role: u.role })),
+      skipped: users.length - created.length
+    });
+  } catch (err) {
+    res.status(500).json({ error: 'Failed to create users' });
+  }
+});
+
 router.put('/users/:id', authenticate, requireRole(['admin']), async (req, res) => {
   try {
     const { username, email, role, isActive } = req.body;
@@ -88,6 +180,7 @@ router.put('/users/:id', authenticate, requireRole(['admin']), async (req, res)
     if (isActive !== undefined) user.isActive = isActive;
 
     await user.save();
+    invalidateUserCache(user._id);
     res.json({ message: 'User updated successfully', user });
   } catch (err) {
     res.status(500).json({ error: 'Failed to update user' });
@@ -1,7 +1,7 @@
 import express from 'express';
 import jwt from 'jsonwebtoken';
 import User from '../models/User.js';
-import { authenticate } from '../middleware/auth.js';
+import { authenticate, getJwtSecret } from '../middleware/auth.js';
 
 const router = express.Router();
 
@@ -19,7 +19,7 @@ router.post('/login', async (req, res) => {
 
     const token = jwt.sign(
       { userId: user._id, role: user.role },
-      process.env.JWT_SECRET || 'shop_secret_fallback',
+      getJwtSecret(),
       { expiresIn: '24h' }
     );
 
@@ -7,7 +7,7 @@ const router = express.Router();
 // List all customers
 router.get('/', authenticate, async (req, res) => {
   try {
-    const customers = await Customer.find().sort({ name: 1 });
+    const customers = await Customer.find().sort({ name: 1 }).lean();
     res.json({ customers });
   } catch (err) {
     res.status(500).json({ error: 'Failed to retrieve customers' });
@@ -17,7 +17,7 @@ router.get('/', authenticate, async (req, res) => {
 // Search customer by phone
 router.get('/phone/:phone', authenticate, async (req, res) => {
   try {
-    const customer = await Customer.findOne({ phone: req.params.phone.trim() });
+    const customer = await Customer.findOne({ phone: req.params.phone.trim() }).lean();
     if (!customer) return res.status(404).json({ error: 'Customer not found' });
     res.json({ customer });
   } catch (err) {
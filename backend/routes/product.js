@@ -2,24 +2,51 @@ import express from 'express';
 import Product from '../models/Product.js';
 import Category from '../models/Category.js';
 import { authenticate, requireRole } from '../middleware/auth.js';
+import { getCachedProducts, invalidateProductCache } from '../utils/productCache.js';
+import { getCachedCategories, addCachedCategory } from '../utils/categoryCache.js';
 
 const router = express.Router();
 
+const DEFAULT_CATEGORIES = Object.freeze([
+  'Grocery', 'Beverages', 'Electronics', 'Apparel', 
+  'Cosmetics', 'Pharmaceuticals', 'Home & Office', 'Bakery', 'Other'
+]);
+
+const NUMERIC_FIELDS = {
+  costPrice: parseFloat,
+  sellingPrice: parseFloat,
+  stockQuantity: parseInt,
+  lowStockThreshold: parseInt
+};
+
+// Parse the numeric product fields present in the body once; null if any is not a number
+function parseProductNumbers(body) {
+  const parsed = {};
+  for (const [field, parse] of Object.entries(NUMERIC_FIELDS)) {
+    if (body[field] === undefined) continue;
+    const value = parse(body[field]);
+    if (Number.isNaN(value)) return null;
+    parsed[field] = value;
+  }
+  return parsed;
+}
+
 // ==================== CUSTOM CATEGORIES ROUTES ====================
 
+async function loadCategories() {
+  let categories = await Category.find().sort({ name: 1 }).lean();
+  
+  if (categories.length === 0) {
+    await Category.insertMany(DEFAULT_CATEGORIES.map(name => ({ name })));
+    categories = await Category.find().sort({ name: 1 }).lean();
+  }
+  return categories;
+}
+
 // Get all categories (and seed defaults if none exist)
 router.get('/categories', authenticate, async (req, res) => {
   try {
-    let categories = await Category.find().sort({ name: 1 });
-    
-    if (categories.length === 0) {
-      const defaults = [
-        'Grocery', 'Beverages', 'Electronics', 'Apparel', 
-        'Cosmetics', 'Pharmaceuticals', 'Home & Office', 'Bakery', 'Other'
-      ];
-      await Category.create(defaults.map(name => ({ name })));
-      categories = await Category.find().sort({ name: 1 });
-    }
+    const categories = await getCachedCategories(loadCategories);
     
     res.json({ categories });
   } catch (err) {
@@ -37,6 +64,8 @@ router.post('/categories', authenticate, requireRole(['admin', 'manager']), asyn
     if (existing) return res.status(400).json({ error: 'Category already exists' });
 
     const category = await Category.create({ name: name.trim() });
+    addCachedCategory(category.toObject());
+
     res.status(201).json({ message: 'Category created successfully', category });
   } catch (err) {
     res.status(500).json({ error: 'Failed to create category' });
@@ -48,7 +77,7 @@ router.post('/categories', authenticate, requireRole(['admin', 'manager']), asyn
 // Get all products
 router.get('/', authenticate, async (req, res) => {
   try {
-    const products = await Product.find().sort({ name: 1 });
+    const products = await getCachedProducts(() => Product.find().sort({ name: 1 }).lean());
     res.json({ products });
   } catch (err) {
     res.status(500).json({ error: 'Failed to retrieve products' });
@@ -58,7 +87,7 @@ router.get('/', authenticate, async (req, res) => {
 // Search product by SKU
 router.get('/sku/:sku', authenticate, async (req, res) => {
   try {
-    const product = await Product.findOne({ sku: req.params.sku.trim() });
+    const product = await Product.findOne({ sku: req.params.sku.trim() }).lean();
     if (!product) return res.status(404).json({ error: 'Product not found with this SKU' });
     res.json({ product });
   } catch (err) {
@@ -69,7 +98,9 @@ router.get('/sku/:sku', authenticate, async (req, res) => {
 // Create product (Admin / Manager)
 router.post('/', authenticate, requireRole(['admin', 'manager']), async (req, res) => {
   try {
-    const { name, sku, category, costPrice, sellingPrice, stockQuantity, lowStockThreshold, supplier } = req.body;
+    const { name, sku, category, supplier } = req.body;
+    const numbers = parseProductNumbers(req.body);
+    if (!numbers) return res.status(400).json({ error: 'Prices and quantities must be numbers' });
     
     const existing = await Product.findOne({ sku: sku.trim() });
     if (existing) return res.status(400).json({ error: 'Product SKU already exists' });
@@ -78,12 +109,10 @@ router.post('/', authenticate, requireRole(['admin', 'manager']), async (req, re
       name,
       sku: sku.trim(),
       category,
-      costPrice: parseFloat(costPrice),
-      sellingPrice: parseFloat(sellingPrice),
-      stockQuantity: parseInt(stockQuantity),
-      lowStockThreshold: parseInt(lowStockThreshold),
+      ...numbers,
       supplier
     });
+    invalidateProductCache();
 
     res.status(201).json({ message: 'Product created successfully', product });
   } catch (err) {
@@ -94,19 +123,20 @@ router.post('/', authenticate, requireRole(['admin', 'manager']), async (req, re
 // Update product
 router.put('/:id', authenticate, requireRole(['admin', 'manager']), async (req, res) => {
   try {
-    const { name, category, costPrice, sellingPrice, stockQuantity, lowStockThreshold, supplier } = req.body;
+    const { name, category, supplier } = req.body;
+    const numbers = parseProductNumbers(req.body);
+    if (!numbers) return res.status(400).json({ error: 'Prices and quantities must be numbers' });
+
     const product = await Product.findById(req.params.id);
     if (!product) return res.status(404).json({ error: 'Product not found' });
 
     if (name) product.name = name;
     if (category) product.category = category;
-    if (costPrice !== undefined) product.costPrice = parseFloat(costPrice);
-    if (sellingPrice !== undefined) product.sellingPrice = parseFloat(sellingPrice);
-    if (stockQuantity !== undefined) product.stockQuantity = parseInt(stockQuantity);
-    if (lowStockThreshold !== undefined) product.lowStockThreshold = parseInt(lowStockThreshold);
+    Object.assign(product, numbers);
     if (supplier) product.supplier = supplier;
 
     await product.save();
+    invalidateProductCache();
     res.json({ message: 'Product updated successfully', product });
   } catch (err) {
     res.status(500).json({ error: 'Failed to update product' });
@@ -117,6 +147,7 @@ router.put('/:id', authenticate, requireRole(['admin', 'manager']), async (req,
 router.delete('/:id', authenticate, requireRole(['admin']), async (req, res) => {
   try {
     await Product.findByIdAndDelete(req.params.id);
+    invalidateProductCache();
     res.json({ message: 'Product deleted successfully' });
   } catch (err) {
     res.status(500).json({ error: 'Failed to delete product' });
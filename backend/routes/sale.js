@@ -1,22 +1,58 @@
 import express from 'express';
+import { once } from 'events';
 import Sale from '../models/Sale.js';
 import Product from '../models/Product.js';
 import Customer from '../models/Customer.js';
 import { authenticate } from '../middleware/auth.js';
+import { invalidateProductCache } from '../utils/productCache.js';
 import { v4 as uuidv4 } from 'uuid';
 
 const router = express.Router();
 
-// Get all sales
+// Wait for the socket to drain, or give up if the client disconnects while it is full
+async function drainOrClose(res) {
+  const abort = new AbortController();
+  try {
+    await Promise.race([
+      once(res, 'drain', { signal: abort.signal }),
+      once(res, 'close', { signal: abort.signal })
+    ]);
+  } finally {
+    abort.abort();
+  }
+}
+
+// Get all sales (streamed newest-first so the full history is never held in memory)
 router.get('/', authenticate, async (req, res) => {
+  let cursor;
   try {
-    const sales = await Sale.find()
+    cursor = Sale.find()
       .populate('cashier', 'username')
       .populate('customer', 'name phone')
-      .sort({ createdAt: -1 });
-    res.json({ sales });
+      .sort({ createdAt: -1 })
+      .lean()
+      .cursor({ batchSize: 512 });
+
+    // The cursor is lazy: fetch the first batch before sending headers so a failed query
+    // still gets the normal 500 JSON response
+    let sale = await cursor.next();
+
+    res.type('json');
+    res.write('{"sales":[');
+    let first = true;
+    while (sale && !res.destroyed) {
+      if (!res.write((first ? '' : ',') + JSON.stringify(sale))) await drainOrClose(res);
+      first = false;
+      sale = await cursor.next();
+    }
+    if (!res.destroyed) res.end(']}');
   } catch (err) {
+    // Once the stream has started the only honest signal left is to cut the connection
+    if (res.headersSent) return res.destroy(err);
     res.status(500).json({ error: 'Failed to retrieve sales' });
+  } finally {
+    // Free the server-side cursor even when the client aborted mid-stream
+    if (cursor) await cursor.close().catch(() => {});
   }
 });
 
@@ -27,57 +63,78 @@ router.post('/checkout', authenticate, async (req, res) => {
 
     if (!items || items.length === 0) return res.status(400).json({ error: 'Cart is empty' });
 
-    // Validate and deduct stock
-    for (const item of items) {
-      const product = await Product.findById(item.productId);
-      if (!product) return res.status(404).json({ error: `Product ${item.name} not found` });
-      
-      if (product.stockQuantity < item.quantity) {
-        return res.status(400).json({ error: `Insufficient stock for ${product.name}. Available: ${product.stockQuantity}` });
+    const restoreStock = (lines) => lines.length === 0 ? null : Product.bulkWrite(lines.map(line => ({
+      updateOne: {
+        filter: { _id: line.product },
+        update: { $inc: { stockQuantity: line.quantity } }
       }
-    }
+    })));
 
-    // Deduct stock
     const saleItems = [];
-    for (const item of items) {
-      const product = await Product.findById(item.productId);
-      product.stockQuantity -= item.quantity;
-      await product.save();
-
-      saleItems.push({
-        product: product._id,
-        name: product.name,
-        quantity: item.quantity,
-        sellingPrice: item.sellingPrice,
-        total: item.quantity * item.sellingPrice
+    let customerObj = null;
+    let sale;
+    const invoiceNumber = 'INV-' + uuidv4().substring(0, 8).toUpperCase();
+    try {
+      // Check and deduct stock in one atomic update per line so concurrent checkouts cannot oversell
+      for (const item of items) {
+        const product = await Product.findOneAndUpdate(
+          { _id: item.productId, stockQuantity: { $gte: item.quantity } },
+          { $inc: { stockQuantity: -item.quantity } },
+          { new: true, projection: { name: 1 } }
+        );
+
+        if (!product) {
+          await restoreStock(saleItems.splice(0));
+          const current = await Product.findById(item.productId).select('name stockQuantity');
+          if (!current) return res.status(404).json({ error: `Product ${item.name} not found` });
+          return res.status(400).json({ error: `Insufficient stock for ${current.name}. Available: ${current.stockQuantity}` });
+        }
+
+        saleItems.push({
+          product: product._id,
+          name: product.name,
+          quantity: item.quantity,
+          sellingPrice: item.sellingPrice,
+          total: item.quantity * item.sellingPrice
+        });
+      }
+
+      if (customerId) customerObj = await Customer.findById(customerId);
+
+      sale = await Sale.create({
+        invoiceNumber,
+        items: saleItems,
+        subtotal: parseFloat(subtotal),
+        tax: parseFloat(tax || 0),
+        discount: parseFloat(discount || 0),
+        totalPrice: parseFloat(totalPrice),
+        amountPaid: parseFloat(amountPaid),
+        changeDue: parseFloat(changeDue),
+        cashier: req.user._id,
+        customer: customerObj ? customerObj._id : null
       });
+    } catch (err) {
+      // Put the stock back so a failed checkout leaves inventory untouched
+      await restoreStock(saleItems);
+      throw err;
+    } finally {
+      // Stock levels changed (or were restored), so cached listings are stale
+      invalidateProductCache();
     }
 
-    // Handle customer spend
-    let customerObj = null;
-    if (customerId) {
-      customerObj = await Customer.findById(customerId);
-      if (customerObj) {
-        customerObj.purchaseCount += 1;
-        customerObj.totalSpent += parseFloat(totalPrice);
-        await customerObj.save();
+    // Handle customer spend once the invoice is recorded; the sale stands even if this fails,
+    // so don't answer with an error that would make the cashier ring it up twice
+    if (customerObj) {
+      try {
+        await Customer.updateOne(
+          { _id: customerObj._id },
+          { $inc: { purchaseCount: 1, totalSpent: parseFloat(totalPrice) } }
+        );
+      } catch (err) {
+        console.error(`Customer spend update failed for ${invoiceNumber}:`, err);
       }
     }
 
-    const invoiceNumber = 'INV-' + uuidv4().substring(0, 8).toUpperCase();
-    const sale = await Sale.create({
-      invoiceNumber,
-      items: saleItems,
-      subtotal: parseFloat(subtotal),
-      tax: parseFloat(tax || 0),
-      discount: parseFloat(discount || 0),
-      totalPrice: parseFloat(totalPrice),
-      amountPaid: parseFloat(amountPaid),
-      changeDue: parseFloat(changeDue),
-      cashier: req.user._id,
-      customer: customerObj ? customerObj._id : null
-    });
-
     // Notify dashboads over Socket.io
     const io = req.app.get('io');
     if (io) {
@@ -6,7 +6,7 @@ const router = express.Router();
 
 router.get('/', authenticate, async (req, res) => {
   try {
-    const vendors = await Vendor.find().sort({ name: 1 });
+    const vendors = await Vendor.find().sort({ name: 1 }).lean();
     res.json({ vendors });
   } catch (err) {
     res.status(500).json({ error: 'Failed to retrieve vendors' });
@@ -4,6 +4,7 @@ import { Server } from 'socket.io';
 import mongoose from 'mongoose';
 import dotenv from 'dotenv';
 import cors from 'cors';
+import fs from 'fs';
 import path from 'path';
 import { fileURLToPath } from 'url';
 
@@ -32,12 +33,19 @@ app.use(cors());
 app.use(express.json());
 app.use(express.urlencoded({ extended: true }));
 
-// Serve static frontend files
-app.use(express.static(path.join(__dirname, '../frontend')));
+const FRONTEND_DIR = path.join(__dirname, '../frontend');
 
-app.get('/', (req, res) => res.sendFile(path.join(__dirname, '../frontend/index.html')));
-app.get('/dashboard', (req, res) => res.sendFile(path.join(__dirname, '../frontend/dashboard.html')));
-app.get('/inventory', (req, res) => res.sendFile(path.join(__dirname, '../frontend/inventory.html')));
+// Read the page shells once at startup instead of stat+read on every request
+const pages = Object.fromEntries(['index', 'dashboard', 'inventory'].map(name => (
+  [name, fs.readFileSync(path.join(FRONTEND_DIR, `${name}.html`))]
+)));
+
+// Serve static frontend files; asset names aren't fingerprinted, so browsers revalidate via ETag
+app.use(express.static(FRONTEND_DIR, { index: false }));
+
+app.get('/', (req, res) => res.type('html').send(pages.index));
+app.get('/dashboard', (req, res) => res.type('html').send(pages.dashboard));
+app.get('/inventory', (req, res) => res.type('html').send(pages.inventory));
 
 app.use('/api/auth', authRoutes);
 app.use('/api/products', productRoutes);
@@ -49,18 +57,55 @@ app.use('/api/admin', adminRoutes);
 const PORT = process.env.PORT || 320;
 const MONGO_URI = process.env.MONGODB_URI || 'mongodb://localhost:27017/shop_management_system';
 
+// One long-lived pool shared by every route; keep a few sockets warm between requests
+const MONGO_OPTIONS = {
+  maxPoolSize: parseInt(process.env.MONGO_MAX_POOL_SIZE || '20'),
+  minPoolSize: parseInt(process.env.MONGO_MIN_POOL_SIZE || '2'),
+  maxIdleTimeMS: 60000,
+  family: 4, // skip the IPv6 lookup round trip on localhost
+  serverSelectionTimeoutMS: 5000
+};
+
 async function startServer() {
   try {
-    await mongoose.connect(MONGO_URI);
+    await mongoose.connect(MONGO_URI, MONGO_OPTIONS);
     console.log('✅ MongoDB connected');
-    await seedDB();
     server.listen(PORT, () => {
       console.log(`✅ Shop Management System running on port ${PORT}`);
     });
+    // Seeding is idempotent and logs its own errors; don't hold up the listener for it
+    seedDB();
   } catch (err) {
     console.error('Startup error:', err);
     process.exit(1);
   }
 }
 
+let shuttingDown = false;
+
+async function shutdown() {
+  // PM2 may send a second signal while we're draining
+  if (shuttingDown) return;
+  shuttingDown = true;
+
+  let exitCode = 0;
+  try {
+    // io.close() disconnects socket clients and then closes the HTTP server;
+    // idle keep-alive sockets would otherwise hold server.close() open
+    await new Promise(resolve => {
+      io.close(() => resolve());
+      server.closeIdleConnections();
+    });
+    await mongoose.connection.close();
+  } catch (err) {
+    console.error('Shutdown error:', err);
+    exitCode = 1;
+  } finally {
+    process.exit(exitCode);
+  }
+}
+
+process.on('SIGINT', shutdown);
+process.on('SIGTERM', shutdown);
+
 startServer();
@@ -0,0 +1,38 @@
+// In-process LRU cache shared by the user, product and category lookups.
+// A generation counter stops a load that was in flight during a write from storing
+// what it read; ttlMs bounds how stale an entry can get.
+export function createCache({ maxSize = 1, ttlMs = Infinity } = {}) {
+  const entries = new Map(); // key -> { value, loadedAt }; insertion order doubles as LRU order
+  let generation = 0;
+
+  return {
+    async get(key, load) {
+      const entry = entries.get(key);
+      entries.delete(key);
+      if (entry && Date.now() - entry.loadedAt < ttlMs) {
+        entries.set(key, entry);
+        return entry.value;
+      }
+
+      const startedAt = generation;
+      const value = await load();
+      if (value != null && startedAt === generation) {
+        entries.set(key, { value, loadedAt: Date.now() });
+        if (entries.size > maxSize) entries.delete(entries.keys().next().value);
+      }
+      return value;
+    },
+
+    // Apply a write to the cached value in place of dropping it
+    update(key, change) {
+      generation += 1;
+      const entry = entries.get(key);
+      if (entry) entry.value = change(entry.value);
+    },
+
+    invalidate(key) {
+      generation += 1;
+      entries.delete(key);
+    }
+  };
+}
@@ -0,0 +1,12 @@
+import { createCache } from './cache.js';
+
+// Write-through category list served by GET /api/products/categories
+const cache = createCache();
+
+const byName = (a, b) => (a.name < b.name ? -1 : a.name > b.name ? 1 : 0);
+
+export const getCachedCategories = (load) => cache.get('all', load);
+
+export const addCachedCategory = (category) => cache.update('all', categories => (
+  categories.some(c => c._id.equals(category._id)) ? categories : [...categories, category].sort(byName)
+));
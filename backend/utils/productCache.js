@@ -0,0 +1,8 @@
+import { createCache } from './cache.js';
+
+// Product list served by GET /api/products.
+// Every route that changes products or stock must call invalidateProductCache().
+const cache = createCache();
+
+export const getCachedProducts = (load) => cache.get('all', load);
+export const invalidateProductCache = () => cache.invalidate('all');
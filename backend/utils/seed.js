@@ -1,14 +1,23 @@
 import User from '../models/User.js';
 import Product from '../models/Product.js';
 import Settings from '../models/Settings.js';
+import { invalidateProductCache } from './productCache.js';
+
+// Bump when a new seed step is added below
+const SEED_VERSION = 1;
 
 export async function seedDB() {
   try {
     // 1. Seed Admin Account
+    // Checked on every boot so a new ADMIN_EMAIL still gets its account on a seeded database
     const adminEmail = process.env.ADMIN_EMAIL || 'admin@maddix.com';
     const adminPassword = process.env.ADMIN_PASSWORD || 'MaddixAdmin123!';
 
-    const existingAdmin = await User.findOne({ email: adminEmail });
+    const [existingAdmin, existingSettings] = await Promise.all([
+      User.exists({ email: adminEmail }),
+      Settings.findOne().select('seedVersion').lean()
+    ]);
+
     if (!existingAdmin) {
       await User.create({
         username: 'admin',
@@ -20,8 +29,10 @@ export async function seedDB() {
       console.log('✅ Default admin user created');
     }
 
+    // The remaining one-time steps are skipped once the database is stamped
+    if (existingSettings && existingSettings.seedVersion >= SEED_VERSION) return;
+
     // 2. Seed Default Settings
-    const existingSettings = await Settings.findOne();
     if (!existingSettings) {
       await Settings.create({
         shopName: 'Maddix Shop',
@@ -34,8 +45,7 @@ export async function seedDB() {
     }
 
     // 3. Seed Default Products (for quick testing/demo)
-    const productCount = await Product.countDocuments();
-    if (productCount === 0) {
+    if (await Product.estimatedDocumentCount() === 0) {
       const defaultProducts = [
         {
           name: 'Coca Cola 500ml',
@@ -79,9 +89,12 @@ export async function seedDB() {
         }
       ];
 
-      await Product.create(defaultProducts);
+      await Product.insertMany(defaultProducts);
+      invalidateProductCache();
       console.log('✅ Default shop products seeded');
     }
+
+    await Settings.updateOne({}, { $set: { seedVersion: SEED_VERSION } });
   } catch (err) {
     console.error('Database seeding error:', err);
   }